@@ -23,7 +23,9 @@
 #if __has_include(<unistd.h>)
     #include <unistd.h>
 #endif
+#include <map>
 #include <memory>
+#include <mutex>
 #include <regex>
 #include "triton/driver/llvm.h"
 #include "triton/driver/dispatch.h"
@@ -94,11 +96,21 @@ static bool find_and_replace(std::string& str, const std::string& begin, const s
 }
 
 std::string path_to_ptxas(int& version) {
+  // probing each candidate spawns a `ptxas --version` process;
+  // only do it once per value of TRITON_PTXAS_PATH
+  static std::mutex cache_mutex;
+  static std::map<std::string, std::pair<std::string, int>> cache;
+  std::string triton_ptxas = tools::getenv("TRITON_PTXAS_PATH");
+  std::lock_guard<std::mutex> lock(cache_mutex);
+  auto it = cache.find(triton_ptxas);
+  if(it != cache.end()){
+    version = it->second.second;
+    return it->second.first;
+  }
   std::vector<std::string> rets;
   std::string ret;
   // search pathes for ptxas
   std::vector<std::string> ptxas_prefixes = {"", "/usr/local/cuda/bin/"};
-  std::string triton_ptxas = tools::getenv("TRITON_PTXAS_PATH");
   if(!triton_ptxas.empty())
     ptxas_prefixes.insert(ptxas_prefixes.begin(), triton_ptxas);
   // see what path for ptxas are valid
@@ -133,6 +145,7 @@ std::string path_to_ptxas(int& version) {
   if ( not found) {
     throw std::runtime_error("Error in parsing version");
   }
+  cache[triton_ptxas] = std::make_pair(ptxas, version);
   return ptxas;
 }
 
@@ -1,4 +1,5 @@
 import os
+import pickle
 import re
 import shutil
 
@@ -86,6 +87,45 @@ def test_reuse():
     for i in range(10):
         kernel[(1,)](x, 1, BLOCK=1024)
     assert counter == 1
+    # a new process only sees the on-disk cache
+    already_compiled = None
+
+    def get_already_compiled(*args, **kwargs):
+        nonlocal already_compiled
+        already_compiled = kwargs['already_compiled']
+    JITFunction.cache_hook = get_already_compiled
+    kernel.bin_cache.clear()
+    kernel[(1,)](x, 1, BLOCK=1024)
+    JITFunction.cache_hook = None
+    assert already_compiled is True
+    assert not [f for f in os.listdir(tmpdir) if f.endswith('.tmp')]
+
+
+def test_recheck_under_lock(monkeypatch):
+    JITFunction.cache_hook = None
+    reset_tmp_dir()
+    x = torch.empty(1, dtype=torch.int32, device='cuda')
+    kernel[(1,)](x, 1, BLOCK=1024)
+    entries = [f for f in os.listdir(tmpdir) if not f.endswith('.lock')]
+    assert len(entries) == 1
+    with open(os.path.join(tmpdir, entries[0]), 'rb') as f:
+        entry = f.read()
+    # emulate another process publishing the entry after our unlocked
+    # read missed it, but before we acquired the lock to compile it
+    reset_tmp_dir()
+    kernel.bin_cache.clear()
+
+    def publish_entry(*args, **kwargs):
+        with open(os.path.join(tmpdir, entries[0]), 'wb') as f:
+            f.write(entry)
+    JITFunction.cache_hook = publish_entry
+
+    def fail_compile(*args, **kwargs):
+        raise AssertionError("kernel should have been loaded from the cache")
+    monkeypatch.setattr(kernel, '_compile', fail_compile)
+    kernel[(1,)](x, 1, BLOCK=1024)
+    JITFunction.cache_hook = None
+    assert len(kernel.bin_cache) == 1
 
 
 @pytest.mark.parametrize('mode', ['enable', 'disable'])
@@ -130,3 +170,21 @@ def test_value_specialization(value: int, value_type: str, device='cuda') -> Non
     cache_str_match = re.match(r'_(\w+)\[multipleof\(\d+\)]_float32\*\[multipleof\(16\)\]', cache_str[-1])
     spec_type = None if cache_str_match is None else cache_str_match.group(1)
     assert spec_type == value_type
+
+
+def test_load_cached_binary(tmp_path):
+    path = str(tmp_path / "entry")
+    # missing file
+    assert JITFunction._load_cached_binary(path, "key") is None
+    # valid entry
+    with open(path, "wb") as f:
+        pickle.dump({"binary": "binary", "key": "key"}, f)
+    assert JITFunction._load_cached_binary(path, "key") == "binary"
+    # entry persisted for a different key
+    assert JITFunction._load_cached_binary(path, "other-key") is None
+    # truncated entry
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:len(data) // 2])
+    assert JITFunction._load_cached_binary(path, "key") is None
@@ -0,0 +1,47 @@
+import pytest
+
+import triton
+import triton.language as tl
+from triton.code_gen import Kernel
+
+
+@triton.jit
+def kernel(X, i, BLOCK: tl.constexpr):
+    tl.store(X, i)
+
+
+@triton.jit
+def constexpr(X, BLOCK: tl.constexpr):
+    tl.store(X, BLOCK)
+
+
+@triton.jit
+def kernel_constexpr_arg(X, constexpr: tl.constexpr):
+    tl.store(X, constexpr)
+
+
+def test_bind_positional_and_keyword():
+    bind_args = Kernel(kernel).bind_args
+    for wargs in [bind_args('x', 1, 2),
+                  bind_args('x', 1, BLOCK=2),
+                  bind_args('x', BLOCK=2, i=1),
+                  bind_args(BLOCK=2, i=1, X='x')]:
+        assert wargs[:2] == ['x', 1]
+        assert isinstance(wargs[2], tl.constexpr)
+        assert wargs[2].value == 2
+
+
+@pytest.mark.parametrize('fn, name', [(constexpr, 'BLOCK'), (kernel_constexpr_arg, 'constexpr')])
+def test_bind_reserved_names(fn, name):
+    wargs = Kernel(fn).bind_args('x', **{name: 4})
+    assert wargs[0] == 'x'
+    assert isinstance(wargs[1], tl.constexpr)
+    assert wargs[1].value == 4
+
+
+def test_bind_missing_argument():
+    bind_args = Kernel(kernel).bind_args
+    with pytest.raises(TypeError, match=r"kernel\(\) missing 1 required positional argument: 'BLOCK'"):
+        bind_args('x', 1)
+    with pytest.raises(TypeError):
+        bind_args('x', 1, 2, 3)
@@ -7,10 +7,9 @@ import hashlib
 import inspect
 import os
 import pickle
-import subprocess
 import sys
-import tempfile
 import textwrap
+import threading
 import time
 import warnings
 from typing import Dict, Set, Tuple, Union
@@ -20,9 +19,13 @@ from filelock import FileLock
 
 import triton
 import triton._C.libtriton.triton as _triton
-from .tools.disasm import extract
 
-current_stream = lambda device: torch.cuda.current_stream(device).cuda_stream
+try:
+    # resolved once here so that launches don't have to build
+    # a `torch.cuda.Stream` object just to read its handle
+    from torch._C import _cuda_getCurrentRawStream as current_stream
+except ImportError:
+    current_stream = lambda device: torch.cuda.current_stream(device).cuda_stream
 
 
 def mangle_ty(ty):
@@ -748,6 +751,9 @@ class LoadedBinary:
     def get_sass(self, fun=None):
         if self.sass:
             return self.sass
+        import tempfile
+
+        from .tools.disasm import extract
         fd, path = tempfile.mkstemp()
         try:
             with open(fd, 'wb') as cubin:
@@ -788,28 +794,68 @@ class OutOfResources(Exception):
         return (type(self), (self.required, self.limit, self.name))
 
 
+# the tables below reference `triton.language`, which isn't
+# available yet when this module is imported, so they are
+# built on first use rather than at import time
+@functools.lru_cache()
+def _type_names():
+    return {
+        triton.language.float8: 'f8',
+        torch.bfloat16: 'bf16',
+        torch.float16: 'f16',
+        torch.float32: 'f32',
+        torch.float64: 'f64',
+        torch.bool: 'i1',
+        torch.int8: 'i8',
+        torch.int16: 'i16',
+        torch.int32: 'i32',
+        torch.int64: 'i64',
+        triton.language.uint8: 'u8',
+        triton.language.uint16: 'u16',
+        triton.language.uint32: 'u32',
+        triton.language.uint64: 'u64',
+    }
+
+
+@functools.lru_cache()
+def _type_map():
+    return {
+        'I': triton.language.int32,
+        'L': triton.language.int64,
+        'f': triton.language.float32,
+        'B': triton.language.int1,
+        'f8': triton.language.float8,
+        'f16': triton.language.float16,
+        'bf16': triton.language.bfloat16,
+        'f32': triton.language.float32,
+        'f64': triton.language.float64,
+        'i1': triton.language.int1,
+        'i8': triton.language.int8,
+        'i16': triton.language.int16,
+        'i32': triton.language.int32,
+        'i64': triton.language.int64,
+        'u8': triton.language.uint8,
+        'u16': triton.language.uint16,
+        'u32': triton.language.uint32,
+        'u64': triton.language.uint64,
+    }
+
+
+@functools.lru_cache()
+def compute_capability(device):
+    # the compute capability of a device never changes during the
+    # lifetime of a process, so there is no need to query the driver
+    # on every launch
+    cc = torch.cuda.get_device_capability(device)
+    return str(cc[0]) + '-' + str(cc[1])
+
+
 class Kernel:
 
     @staticmethod
     def _type_name(obj):
-        type_names = {
-            triton.language.float8: 'f8',
-            torch.bfloat16: 'bf16',
-            torch.float16: 'f16',
-            torch.float32: 'f32',
-            torch.float64: 'f64',
-            torch.bool: 'i1',
-            torch.int8: 'i8',
-            torch.int16: 'i16',
-            torch.int32: 'i32',
-            torch.int64: 'i64',
-            triton.language.uint8: 'u8',
-            triton.language.uint16: 'u16',
-            triton.language.uint32: 'u32',
-            triton.language.uint64: 'u64',
-        }
         if hasattr(obj, 'data_ptr'):
-            return type_names[obj.dtype]
+            return _type_names()[obj.dtype]
         if isinstance(obj, triton.language.constexpr):
             obj = obj.value
         if isinstance(obj, int):
@@ -844,26 +890,7 @@ class Kernel:
     @staticmethod
     def _to_triton_ir(obj):
         which, name = obj
-        type_map = {
-            'I': triton.language.int32,
-            'L': triton.language.int64,
-            'f': triton.language.float32,
-            'B': triton.language.int1,
-            'f8': triton.language.float8,
-            'f16': triton.language.float16,
-            'bf16': triton.language.bfloat16,
-            'f32': triton.language.float32,
-            'f64': triton.language.float64,
-            'i1': triton.language.int1,
-            'i8': triton.language.int8,
-            'i16': triton.language.int16,
-            'i32': triton.language.int32,
-            'i64': triton.language.int64,
-            'u8': triton.language.uint8,
-            'u16': triton.language.uint16,
-            'u32': triton.language.uint32,
-            'u64': triton.language.uint64,
-        }
+        type_map = _type_map()
         # convert torch.Tensor to Triton IR pointers
         if which == 'ptr':
             elt_ty = type_map[name]
@@ -883,59 +910,95 @@ class Kernel:
             return 2
         return 1
 
+    @staticmethod
+    def _make_binder(fn):
+        # generate a function with the same signature as `fn` that returns its
+        # arguments as a list, so that matching keyword arguments to positions
+        # and wrapping constexprs is done by the interpreter on each launch.
+        # The function is named after the kernel so that binding errors refer
+        # to it, and is created by a factory so that the constexpr helper is
+        # a closure variable that can't clash with the kernel's parameters
+        name = fn.__name__
+        params = ', '.join(fn.arg_names)
+        values = []
+        for i, arg_name in enumerate(fn.arg_names):
+            if i in fn.annotations:
+                assert fn.annotations[i] == triton.language.constexpr, "only constexpr annotations are supported for now"
+                values.append(f'__triton_constexpr({arg_name})')
+            else:
+                values.append(arg_name)
+        src = f"def __triton_make(__triton_constexpr):\n" \
+              f"    def {name}({params}):\n" \
+              f"        return [{', '.join(values)}]\n" \
+              f"    return {name}\n"
+        scope = dict()
+        exec(src, scope)
+        bind = scope['__triton_make'](triton.language.constexpr)
+        bind.__qualname__ = name
+        return bind
+
     def __init__(self, fn):
         self.fn = fn
+        self.bind_args = Kernel._make_binder(fn)
+        # per-thread bitmask of the devices whose context has been made
+        # current (CUDA contexts are current on a per-thread basis)
+        self.initialized_devices = threading.local()
+        # resolve the callables used on every launch once, instead of
+        # going through module attributes and bound-method creation each time
+        self.launch = _triton.runtime.launch
+        self.add_to_cache_fn = self.add_to_cache
 
     def add_to_cache(self, key, wargs, device_idx, num_warps, num_stages):
-        tensor_idxs = [i for i, arg in enumerate(wargs) if hasattr(arg, 'data_ptr')]
-
-        # attributes
+        # attributes, constants and argument types are all
+        # collected in a single pass over the arguments
         attributes = dict()
+        constants = dict()
+        arg_types = []
         for i, arg in enumerate(wargs):
-            if i in self.fn.do_not_specialize:
-                continue
-            if isinstance(arg, int):
-                attributes[i] = Kernel.pow2_divisor(arg)
-            elif i in tensor_idxs:
-                addr = arg.data_ptr()
-                range_size = _triton.runtime.get_pointer_range_size(addr)
-                attributes[i] = min(Kernel.pow2_divisor(addr),
-                                    Kernel.pow2_divisor(range_size))
-        # transforms ints whose value is one into constants for just-in-time compilation
-        constants = {i: arg for i, arg in enumerate(wargs) if isinstance(arg, int) and arg == 1 and i not in self.fn.do_not_specialize}
-        constants.update({i: arg.value for i, arg in enumerate(wargs) if isinstance(arg, triton.language.constexpr)})
-        constants.update({i: None for i, arg in enumerate(wargs) if arg is None})
-        arg_types = [Kernel._to_python_ir(arg) for i, arg in enumerate(wargs) if i not in constants]
+            specialize = i not in self.fn.do_not_specialize
+            # attributes
+            if specialize:
+                if isinstance(arg, int):
+                    attributes[i] = Kernel.pow2_divisor(arg)
+                elif hasattr(arg, 'data_ptr'):
+                    addr = arg.data_ptr()
+                    range_size = _triton.runtime.get_pointer_range_size(addr)
+                    attributes[i] = min(Kernel.pow2_divisor(addr),
+                                        Kernel.pow2_divisor(range_size))
+            # transforms ints whose value is one into constants for just-in-time compilation
+            if isinstance(arg, int) and arg == 1 and specialize:
+                constants[i] = arg
+            elif isinstance(arg, triton.language.constexpr):
+                constants[i] = arg.value
+            elif arg is None:
+                constants[i] = None
+            else:
+                arg_types.append(Kernel._to_python_ir(arg))
         return self.fn._warmup(key, arg_types=arg_types, device=device_idx, attributes=attributes, constants=constants, num_warps=num_warps, num_stages=num_stages, is_manual_warmup=False)
 
     def __call__(self, *wargs, grid, num_warps=4, num_stages=2, **kwargs):
-        # handle arguments passed by name
-        kwargs = {self.fn.arg_names.index(name): value for name, value in kwargs.items()}
-        wargs = list(wargs)
-        for i, pos in enumerate(sorted(kwargs)):
-            wargs.insert(pos + i, kwargs[pos])
-        if len(wargs) != len(self.fn.arg_names):
-            raise TypeError(f"Function takes {len(self.fn.arg_names)} positional arguments but {len(wargs)} were given")
-        # handle annotations
-        for pos, _type in self.fn.annotations.items():
-            assert _type == triton.language.constexpr, "only constexpr annotations are supported for now"
-            wargs[pos] = _type(wargs[pos])
+        # handle arguments passed by name and annotations
+        wargs = self.bind_args(*wargs, **kwargs)
         # check that tensors are on GPU.
         for arg in wargs:
             if hasattr(arg, 'data_ptr'):
                 assert arg.is_cuda, "All tensors must be on GPU!"
         # set device (i.e., make sure torch has the context initialized)
+        # this only needs to be done once per device and calling thread
         device = torch.cuda.current_device()
-        torch.cuda.set_device(device)
+        bit = 1 << device
+        initialized = getattr(self.initialized_devices, 'mask', 0)
+        if not initialized & bit:
+            torch.cuda.set_device(device)
+            self.initialized_devices.mask = initialized | bit
         # query compute capability
-        cc = torch.cuda.get_device_capability(device)
-        cc = str(cc[0]) + '-' + str(cc[1])
-        cache_key = self.fn.cache_key + cc
+        fn = self.fn
+        cache_key = fn.cache_key + compute_capability(device)
         # query current stream
         stream = current_stream(device)
-        return _triton.runtime.launch(wargs, self.fn.do_not_specialize, cache_key, self.fn.arg_names,
-                                      device, stream, self.fn.bin_cache, num_warps, num_stages, self.add_to_cache,
-                                      grid)
+        return self.launch(wargs, fn.do_not_specialize, cache_key, fn.arg_names,
+                           device, stream, fn.bin_cache, num_warps, num_stages, self.add_to_cache_fn,
+                           grid)
 
 
 class Launcher:
@@ -1037,6 +1100,7 @@ class Autotuner:
 @functools.lru_cache()
 def version_key():
     import pkgutil
+    import subprocess
     contents = []
     # frontend
     with open(triton.code_gen.__file__, "rb") as f:
@@ -1183,18 +1247,19 @@ class JITFunction:
             os.makedirs(cache_dir, exist_ok=True)
 
         if cache_dir:
-            bin_cache_path = os.path.join(cache_dir, hashed_key)
+            # prefix entries with the kernel name so that they can be
+            # identified (and cleaned up) without unpickling them
+            bin_cache_path = os.path.join(cache_dir, f"{self.__name__}-{hashed_key}")
             bin_lock_path = bin_cache_path + ".lock"
         else:
             bin_cache_path = None
             bin_lock_path = None
 
+        # entries are only ever published with `os.replace`, so
+        # reading them doesn't require taking the lock
         binary = None
-        if bin_cache_path and os.path.exists(bin_cache_path):
-            assert bin_lock_path is not None
-            with FileLock(bin_lock_path):
-                with open(bin_cache_path, 'rb') as f:
-                    binary = pickle.load(f)["binary"]
+        if bin_cache_path:
+            binary = JITFunction._load_cached_binary(bin_cache_path, key)
 
         compile = dict(arg_types=arg_types, device=device, attributes=attributes, constants=constants, num_warps=num_warps, num_stages=num_stages)
         if JITFunction.cache_hook is not None:
@@ -1212,19 +1277,45 @@ class JITFunction:
             if noop:
                 return True
 
-        if binary is None:
-            binary = self._compile(**compile)
-
-        if bin_cache_path:
+        if binary is None and bin_cache_path:
             assert bin_lock_path is not None
+            # hold the lock while compiling so that concurrent processes
+            # (e.g., one per GPU) don't all compile the same kernel
             with FileLock(bin_lock_path):
-                with open(bin_cache_path + ".tmp", "wb") as f:
-                    pickle.dump({"binary": binary, "key": key}, f)
-                os.rename(bin_cache_path + ".tmp", bin_cache_path)
+                # another process may have populated the cache while
+                # we were waiting for the lock
+                binary = JITFunction._load_cached_binary(bin_cache_path, key)
+                if binary is None:
+                    binary = self._compile(**compile)
+                    # write to a temporary file first so that a crash can't
+                    # leave a truncated entry behind under the final name
+                    with open(bin_cache_path + ".tmp", "wb") as f:
+                        pickle.dump({"binary": binary, "key": key}, f)
+                    os.replace(bin_cache_path + ".tmp", bin_cache_path)
+        elif binary is None:
+            binary = self._compile(**compile)
 
         self.bin_cache[key] = LoadedBinary(device, binary)
         return False
 
+    @staticmethod
+    def _load_cached_binary(bin_cache_path, key):
+        # opening the file directly saves a separate existence check
+        try:
+            with open(bin_cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (EOFError, pickle.UnpicklingError):
+            # corrupted entry (e.g., written by an interrupted process);
+            # treat it as a miss so that it gets recompiled and overwritten
+            return None
+        # the file name is only a digest of `key`; make sure
+        # the persisted entry was actually built for it
+        if cached["key"] != key:
+            return None
+        return cached["binary"]
+
     def _compile(self, arg_types, device, attributes, constants, num_warps, num_stages):
         # create IR module
         context = _triton.ir.context()
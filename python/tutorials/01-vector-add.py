@@ -12,23 +12,38 @@ In this tutorial, you will write a simple vector addition using Triton and learn
 # Compute Kernel
 # --------------------------
 
+from typing import Optional
+
 import torch
 
 import triton
 import triton.language as tl
 
 
+# The best block size for a streaming kernel like this one depends on the GPU and on the
+# size of the input, so we let `triton.autotune` pick it (along with `num_warps`) anytime
+# the value of `n_elements` changes.
+# Triton spreads the BLOCK_SIZE contiguous elements of a block over its threads, and can
+# only use 128-bit loads and stores when each thread owns at least 4 consecutive float32.
+# We therefore skip configurations where a block has fewer than 4 elements per thread.
+@triton.autotune(
+    configs=[
+        triton.Config({'BLOCK_SIZE': block_size}, num_warps=num_warps)
+        for block_size in [256, 512, 1024, 2048, 4096]
+        for num_warps in [2, 4, 8]
+        if block_size >= 4 * 32 * num_warps
+    ],
+    key=['n_elements'],
+)
 @triton.jit
 def add_kernel(
     x_ptr,  # *Pointer* to first input vector
     y_ptr,  # *Pointer* to second input vector
     output_ptr,  # *Pointer* to output vector
     n_elements,  # Size of the vector
-    time_start_ptr, time_end_ptr,
     BLOCK_SIZE: tl.constexpr,  # Number of elements each program should process
                  # NOTE: `constexpr` so it can be used as a shape value
 ):
-    tl.atomic_min(time_start_ptr, tl.clock())
     # There are multiple 'program's processing different data. We identify which program
     # we are here
     pid = tl.program_id(axis=0)  # We use a 1D launch grid so axis is 0
@@ -47,21 +62,22 @@ def add_kernel(
     output = x + y
     # Write x + y back to DRAM
     tl.store(output_ptr + offsets, output, mask=mask)
-    tl.atomic_max(time_end_ptr, tl.clock())
 
 
 # %%
-# Let's also declare a helper function to (1) allocate the `z` tensor
-# and (2) enqueue the above kernel with appropriate grid/block sizes.
+# Let's also declare a helper function to (1) allocate the `z` tensor, unless the caller
+# provides a buffer to reuse, and (2) enqueue the above kernel with appropriate grid/block sizes.
 
 
-def add(x: torch.Tensor, y: torch.Tensor):
-    time_start = torch.zeros(1, dtype=torch.int64, device='cuda')
-    time_end = torch.zeros(1, dtype=torch.int64, device='cuda')
+def add(x: torch.Tensor, y: torch.Tensor, out: Optional[torch.Tensor] = None):
     # We need to preallocate the output
-    output = torch.empty_like(x)
+    output = torch.empty_like(x) if out is None else out
     assert x.is_cuda and y.is_cuda and output.is_cuda
-    n_elements = output.numel()
+    # the kernel indexes all three tensors with the same flat offsets, so the output
+    # must be a contiguous buffer with the same shape, dtype and device as `x`
+    assert output.shape == x.shape and output.dtype == x.dtype and output.device == x.device
+    assert output.is_contiguous()
+    n_elements = x.numel()
     # The SPMD launch grid denotes the number of kernel instances that run in parallel.
     # It is analogous to CUDA launch grids. It can be either Tuple[int], or Callable(metaparameters) -> Tuple[int]
     # In this case, we use a 1D grid where the size is the number of blocks
@@ -69,8 +85,8 @@ def add(x: torch.Tensor, y: torch.Tensor):
     # NOTE:
     #  - each torch.tensor object is implicitly converted into a pointer to its first element.
     #  - `triton.jit`'ed functions can be index with a launch grid to obtain a callable GPU kernel
-    #  - don't forget to pass meta-parameters as keywords arguments
-    add_kernel[grid](x, y, output, n_elements, time_start, time_end, BLOCK_SIZE=1024)
+    #  - `BLOCK_SIZE` is chosen by the auto-tuner, so we don't pass it here
+    add_kernel[grid](x, y, output, n_elements)
     # We return a handle to z but, since `torch.cuda.synchronize()` hasn't been called, the kernel is still
     # running asynchronously at this point.
     return output
@@ -84,13 +100,22 @@ size = 98432
 x = torch.rand(size, device='cuda')
 y = torch.rand(size, device='cuda')
 output_torch = x + y
+# the first call compiles and auto-tunes `add_kernel`, so we time a second one.
+# CUDA events let us time the kernel from the host without instrumenting the kernel itself
+output_triton = add(x, y)
+start_event = torch.cuda.Event(enable_timing=True)
+end_event = torch.cuda.Event(enable_timing=True)
+start_event.record()
 output_triton = add(x, y)
+end_event.record()
+torch.cuda.synchronize()
 print(output_torch)
 print(output_triton)
 print(
     f'The maximum difference between torch and triton is '
     f'{torch.max(torch.abs(output_torch - output_triton))}'
 )
+print(f'A warmed-up call to `add` took {start_event.elapsed_time(end_event):.3f}ms')
 
 # %%
 # Seems like we're good to go!
@@ -125,7 +150,9 @@ def benchmark(size, provider):
     if provider == 'torch':
         ms, min_ms, max_ms = triton.testing.do_bench(lambda: x + y)
     if provider == 'triton':
-        ms, min_ms, max_ms = triton.testing.do_bench(lambda: add(x, y))
+        # preallocate the output once so that it is reused across runs
+        output = torch.empty_like(x)
+        ms, min_ms, max_ms = triton.testing.do_bench(lambda: add(x, y, out=output))
     gbps = lambda ms: 12 * size / ms * 1e-6
     return gbps(ms), gbps(max_ms), gbps(min_ms)
 